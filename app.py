@@ -4,8 +4,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
 import warnings
+from config import (DATA_FILE, PARQUET_FILE, DATE_FORMAT, DAY_ORDER, COLUMN_DTYPES,
+                    MAX_CACHE_ENTRIES, MAX_CACHED_FIGURES, QUALITY_SCORE_WEIGHTS,
+                    EXPORT_FILENAME)
 warnings.filterwarnings('ignore')
 
 # Page configuration
@@ -41,22 +48,78 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Parse the raw CSV
+def read_csv_data(path):
+    """Read the CSV and derive the date-based columns"""
+    # Read CSV with compact dtypes (categorical dimensions, 32-bit metrics)
+    try:
+        df = pd.read_csv(path, dtype=COLUMN_DTYPES)
+    except ValueError:
+        # Empty cells can't be held by the int32 columns: leave those as float (NaN) instead
+        df = pd.read_csv(path, dtype={col: dtype for col, dtype in COLUMN_DTYPES.items() if dtype != 'int32'})
+    
+    # Parse date column - your format is DD-MM-YYYY HH:MM
+    dates = pd.to_datetime(df["date"], format=DATE_FORMAT, cache=True, errors="coerce")
+    
+    # Fall back to flexible parsing only for rows that don't match (e.g. missing time)
+    unparsed = dates.isna() & df["date"].notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(df.loc[unparsed, "date"], format="mixed", dayfirst=True, errors="coerce")
+    df["date"] = dates
+    
+    # Create derived columns
+    df['date_only'] = df['date'].dt.date
+    df['epoch_day'] = df['date'].values.astype('datetime64[D]').astype(np.int64)  # integer day for fast filtering
+    df['hour'] = df['date'].dt.hour
+    df['day_of_week'] = pd.Categorical(df['date'].dt.day_name(), categories=DAY_ORDER, ordered=True)
+    df['week'] = df['date'].dt.isocalendar().week
+    
+    return df
+
+# Bump whenever read_csv_data changes what it derives, so older Parquet copies get rebuilt
+PARQUET_LAYOUT_VERSION = 1
+
+def _parquet_key():
+    """Identity of the Parquet copy: the CSV's modification time and size, the schema and the layout version"""
+    stat = os.stat(DATA_FILE)
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{COLUMN_DTYPES}:{PARQUET_LAYOUT_VERSION}".encode()
+
+def _read_parquet_copy(key):
+    """The parsed Parquet copy if it was written for this key, else None"""
+    try:
+        metadata = pq.read_schema(PARQUET_FILE).metadata or {}
+        if metadata.get(b'source_key') == key:
+            return pd.read_parquet(PARQUET_FILE, engine='pyarrow')
+    except (OSError, ValueError):
+        pass  # Missing or unreadable (e.g. truncated) copy: parse the CSV again
+    return None
+
+def _write_parquet_copy(df, key):
+    """Store the parsed frame with its key in the file metadata"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b'source_key': key})
+    
+    # Write to a temporary name first so an interrupted write never replaces a good copy
+    pq.write_table(table, PARQUET_FILE + '.tmp', compression='zstd')
+    os.replace(PARQUET_FILE + '.tmp', PARQUET_FILE)
+
 # Load data with caching
 @st.cache_data
 def load_data():
     """Load and preprocess the web traffic data"""
     try:
-        # Read CSV
-        df = pd.read_csv('web_traffic_data.csv')
+        # Reuse the parsed Parquet copy unless the CSV or the parsing has changed since it was written
+        key = _parquet_key()
+        df = _read_parquet_copy(key)
+        if df is not None:
+            return df
         
-        # Parse date column - your format is DD-MM-YYYY HH:MM
-        df["date"] = pd.to_datetime(df["date"], format="mixed", dayfirst=True, errors="coerce")
+        df = read_csv_data(DATA_FILE)
         
-        # Create derived columns
-        df['date_only'] = df['date'].dt.date
-        df['hour'] = df['date'].dt.hour
-        df['day_of_week'] = df['date'].dt.day_name()
-        df['week'] = df['date'].dt.isocalendar().week
+        try:
+            _write_parquet_copy(df, key)
+        except (OSError, ValueError):
+            pass  # Read-only deployments just keep parsing the CSV
         
         return df
     except Exception as e:
@@ -64,9 +127,8 @@ def load_data():
         st.stop()
 
 # Calculate KPIs
-@st.cache_data
-def calculate_kpis(df):
-    """Calculate key performance indicators"""
+def calculate_kpis(grouped):
+    """Calculate key performance indicators from the fused aggregate"""
     
     def format_number(num):
         """Format large numbers into human-readable strings (e.g., 1.2M, 450K)"""
@@ -79,11 +141,13 @@ def calculate_kpis(df):
         else:
             return str(int(num))
     
-    total_sessions = df['sessions'].sum()
-    total_users = df['users'].sum()
-    total_conversions = df['conversions'].sum()
-    avg_bounce_rate = df['bounce_rate'].mean()
-    avg_session_duration = df['avg_session_duration'].mean()
+    total_sessions = grouped['sessions'].sum()
+    total_users = grouped['users'].sum()
+    total_conversions = grouped['conversions'].sum()
+    bounce_rate_n = grouped['bounce_rate_n'].sum()
+    duration_n = grouped['duration_n'].sum()
+    avg_bounce_rate = grouped['bounce_rate_sum'].sum() / bounce_rate_n if bounce_rate_n > 0 else 0
+    avg_session_duration = grouped['duration_sum'].sum() / duration_n if duration_n > 0 else 0
     conversion_rate = (total_conversions / total_sessions * 100) if total_sessions > 0 else 0
     
     return {
@@ -95,84 +159,259 @@ def calculate_kpis(df):
         'conversion_rate': round(conversion_rate, 2)
     }
 
+# Filter helpers
+def _isin_codes(column, selected):
+    """Match a categorical column against selected labels via a lookup table on its codes"""
+    categories = column.cat.categories
+    sel_codes = categories.get_indexer(list(selected))
+    
+    # One slot per category plus a trailing False slot that missing values (code -1) land on
+    keep = np.zeros(len(categories) + 1, dtype=bool)
+    keep[sel_codes[sel_codes >= 0]] = True
+    return keep[column.cat.codes.values]
+
+def filter_data(df, date_lo, date_hi, pages, devices, countries):
+    """Apply the sidebar selection; a key of all None keeps every row that has a date, page, device and country"""
+    # AND every condition into one mask in place rather than combining temporaries
+    # (DataFrame.query/eval with numexpr measured ~6x slower here: its `in` tests
+    # compare category labels, while the lookup tables below index integer codes)
+    day = df['epoch_day'].values
+    if date_lo is None:
+        mask = df['date'].notna().values
+    else:
+        mask = day >= np.datetime64(date_lo, 'D').astype(np.int64)
+        mask &= day <= np.datetime64(date_hi, 'D').astype(np.int64)
+    
+    # Dimensions with every value selected (the default) don't need a membership test;
+    # just drop the missing values (code -1), as the fused groupby does
+    for col, selected in (('page', pages), ('device', devices), ('country', countries)):
+        if selected is not None and len(selected) < len(df[col].cat.categories):
+            mask &= _isin_codes(df[col], selected)
+        else:
+            mask &= df[col].cat.codes.values >= 0
+    
+    # The default view of a complete dataset keeps every row: share the frame instead of copying it
+    return df if mask.all() else df[mask]
+
+def _rollup(grouped, level, columns):
+    """Roll the fused aggregate up to one dimension, turning sums back into means"""
+    # Scatter-add on the level codes instead of a second hash groupby
+    position = grouped.index.names.index(level)
+    codes = grouped.index.codes[position]
+    labels = grouped.index.levels[position]
+    rows = np.bincount(codes, weights=grouped['rows'].values, minlength=len(labels))
+    present = rows > 0
+    
+    def total(col):
+        return np.bincount(codes, weights=grouped[col].values, minlength=len(labels))[present]
+    
+    stats = pd.DataFrame(index=labels[present])
+    # Counts come back as 64-bit integers (a label's total can outgrow the per-group int32);
+    # float columns (counts with missing values) stay float like groupby's sum
+    for col in ('sessions', 'users', 'conversions'):
+        if col in columns:
+            stats[col] = total(col).astype(np.int64 if grouped[col].dtype.kind in 'iu' else np.float64)
+    # Means are over the non-missing values only, as groupby's mean would be
+    stats['bounce_rate'] = total('bounce_rate_sum') / total('bounce_rate_n')
+    stats['avg_session_duration'] = total('duration_sum') / total('duration_n')
+    return stats[columns].reset_index()
+
 # Page performance analysis
-@st.cache_data
-def analyze_page_performance(df):
+def analyze_page_performance(grouped):
     """Segment pages into performance categories"""
-    page_stats = df.groupby('page').agg({
-        'sessions': 'sum',
-        'conversions': 'sum',
-        'bounce_rate': 'mean',
-        'avg_session_duration': 'mean'
-    }).reset_index()
-    
-    page_stats['conversion_rate'] = (page_stats['conversions'] / page_stats['sessions'] * 100)
+    page_stats = _rollup(grouped, 'page', ['sessions', 'conversions', 'bounce_rate', 'avg_session_duration'])
+    
+    # Work on the raw arrays so the score is one fused expression without Series temporaries
+    bounce = page_stats['bounce_rate'].values
+    conversion_rate = page_stats['conversions'].values / page_stats['sessions'].values * 100
+    duration = page_stats['avg_session_duration'].values
+    max_duration = (duration.max() if duration.size else 0) or 1.0
+    
+    weights = QUALITY_SCORE_WEIGHTS
+    page_stats['conversion_rate'] = conversion_rate
     page_stats['quality_score'] = (
-        (1 - page_stats['bounce_rate']) * 0.3 + 
-        (page_stats['conversion_rate'] / 100) * 0.4 +
-        (page_stats['avg_session_duration'] / page_stats['avg_session_duration'].max()) * 0.3
+        (1 - bounce) * weights['bounce_rate'] +
+        (conversion_rate / 100) * weights['conversion_rate'] +
+        (duration / max_duration) * weights['session_duration']
     ) * 100
     
     # Categorize pages
     median_sessions = page_stats['sessions'].median()
     median_conversions = page_stats['conversion_rate'].median()
     
-    def categorize_page(row):
-        if row['sessions'] >= median_sessions and row['conversion_rate'] >= median_conversions:
-            return 'Star Performers'
-        elif row['sessions'] >= median_sessions and row['conversion_rate'] < median_conversions:
-            return 'High Traffic - Low Conversion'
-        elif row['sessions'] < median_sessions and row['conversion_rate'] >= median_conversions:
-            return 'Hidden Gems'
-        else:
-            return 'Needs Attention'
-    
-    page_stats['category'] = page_stats.apply(categorize_page, axis=1)
+    s_hi = page_stats['sessions'].values >= median_sessions
+    c_hi = conversion_rate >= median_conversions
+    category = np.select(
+        [s_hi & c_hi, s_hi & ~c_hi, ~s_hi & c_hi],
+        ['Star Performers', 'High Traffic - Low Conversion', 'Hidden Gems'],
+        default='Needs Attention'
+    )
+    page_stats['category'] = pd.Categorical(
+        category,
+        categories=['Star Performers', 'High Traffic - Low Conversion', 'Hidden Gems', 'Needs Attention']
+    )
     return page_stats
 
 # Device performance analysis
-@st.cache_data
-def analyze_device_performance(df):
+def analyze_device_performance(grouped):
     """Analyze performance by device type"""
-    device_stats = df.groupby('device').agg({
-        'sessions': 'sum',
-        'users': 'sum',
-        'conversions': 'sum',
-        'bounce_rate': 'mean',
-        'avg_session_duration': 'mean'
-    }).reset_index()
+    device_stats = _rollup(grouped, 'device', ['sessions', 'users', 'conversions', 'bounce_rate', 'avg_session_duration'])
     
     device_stats['conversion_rate'] = (device_stats['conversions'] / device_stats['sessions'] * 100)
     return device_stats
 
 # Country performance analysis
-@st.cache_data
-def analyze_country_performance(df):
+def analyze_country_performance(grouped):
     """Analyze performance by country"""
-    country_stats = df.groupby('country').agg({
-        'sessions': 'sum',
-        'users': 'sum',
-        'conversions': 'sum',
-        'bounce_rate': 'mean',
-        'avg_session_duration': 'mean'
-    }).reset_index()
+    country_stats = _rollup(grouped, 'country', ['sessions', 'users', 'conversions', 'bounce_rate', 'avg_session_duration'])
     
     country_stats['conversion_rate'] = (country_stats['conversions'] / country_stats['sessions'] * 100)
     return country_stats
 
 # Time-based analysis
-@st.cache_data
-def analyze_time_trends(df):
+def analyze_time_trends(grouped):
     """Analyze trends over time"""
-    daily_stats = df.groupby('date_only').agg({
-        'sessions': 'sum',
-        'conversions': 'sum',
-        'bounce_rate': 'mean'
-    }).reset_index()
+    daily_stats = _rollup(grouped, 'date_only', ['sessions', 'conversions', 'bounce_rate'])
     
     daily_stats['conversion_rate'] = (daily_stats['conversions'] / daily_stats['sessions'] * 100)
     return daily_stats
 
+# Day-of-week x hour grids
+def build_time_grids(df):
+    """Scatter-add the time-of-day metrics into 7x24 day-of-week by hour grids"""
+    dow = df['day_of_week'].cat.codes.values.astype(np.int64)
+    valid = dow >= 0
+    bins = dow[valid] * 24 + df['hour'].values[valid].astype(np.int64)
+    
+    def scatter(col):
+        # Missing values add 0 (one NaN weight would turn its whole bin into NaN)
+        weights = df[col].values[valid]
+        if weights.dtype.kind == 'f':
+            weights = np.where(np.isnan(weights), 0, weights)
+        return np.bincount(bins, weights=weights, minlength=7 * 24).reshape(7, 24)
+    
+    bounce_known = ~np.isnan(df['bounce_rate'].values[valid])
+    return {
+        'sessions': scatter('sessions').astype(np.int64),
+        'conversions': scatter('conversions').astype(np.int64),
+        'bounce_rate_sum': scatter('bounce_rate'),
+        'bounce_rate_n': np.bincount(bins[bounce_known], minlength=7 * 24).reshape(7, 24),
+        'rows': np.bincount(bins, minlength=7 * 24).reshape(7, 24)
+    }
+
+def _collapse_grids(grids, axis):
+    """Sum the time grids over one axis and rebuild the bounce rate mean over non-missing rows"""
+    rows = grids['rows'].sum(axis=axis)
+    stats = pd.DataFrame({
+        'sessions': grids['sessions'].sum(axis=axis),
+        'conversions': grids['conversions'].sum(axis=axis),
+        'bounce_rate': grids['bounce_rate_sum'].sum(axis=axis) / grids['bounce_rate_n'].sum(axis=axis)
+    })
+    stats['conversion_rate'] = (stats['conversions'] / stats['sessions'] * 100)
+    return stats, rows > 0
+
+# Day-of-week x hour heatmap
+def build_heatmap(grids):
+    """Sessions per day of week and hour, limited to the days and hours present"""
+    sessions = grids['sessions'].astype(float)
+    sessions[grids['rows'] == 0] = np.nan
+    
+    heatmap = pd.DataFrame(sessions, index=DAY_ORDER, columns=range(24))
+    heatmap.index.name = 'day_of_week'
+    heatmap.columns.name = 'hour'
+    return heatmap.dropna(how='all').dropna(axis=1, how='all')
+
+# Hour-of-day analysis
+def analyze_hourly_patterns(grids):
+    """Analyze performance by hour of day"""
+    hourly_perf, present = _collapse_grids(grids, axis=0)
+    hourly_perf.insert(0, 'hour', np.arange(24))
+    return hourly_perf[present].reset_index(drop=True)
+
+# Day-of-week analysis
+def analyze_weekday_patterns(grids):
+    """Analyze performance by day of week"""
+    dow_stats, present = _collapse_grids(grids, axis=1)
+    dow_stats.insert(0, 'day_of_week', pd.Categorical(DAY_ORDER, categories=DAY_ORDER, ordered=True))
+    return dow_stats[present].reset_index(drop=True)
+
+# Ranking helper
+def top_rows(df, n, column):
+    """Top-n rows by column via partial selection (np.argpartition), largest first"""
+    values = df[column].values
+    idx = np.argpartition(-values, n - 1)[:n] if n < len(values) else np.arange(len(values))
+    return df.iloc[idx[np.argsort(-values[idx], kind='stable')]]
+
+# Sums and non-null counts kept by the fused aggregations; means are rebuilt from them in _rollup
+FUSED_AGGREGATIONS = dict(
+    sessions=('sessions', 'sum'),
+    users=('users', 'sum'),
+    conversions=('conversions', 'sum'),
+    bounce_rate_sum=('bounce_rate', 'sum'),
+    duration_sum=('avg_session_duration', 'sum'),
+    bounce_rate_n=('bounce_rate', 'count'),
+    duration_n=('avg_session_duration', 'count'),
+    rows=('sessions', 'size')
+)
+
+# Fused aggregation for all breakdowns
+# (cached on the filter selection, so Streamlit never has to hash a DataFrame)
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES)
+def compute_all_stats(date_lo, date_hi, pages, devices, countries):
+    """Aggregate every breakdown the tabs need from one groupby and one bincount pass"""
+    filtered_df = filter_data(load_data(), date_lo, date_hi, pages, devices, countries)
+    
+    # The breakdowns are independent and spend their time in numpy/pandas kernels
+    # that release the GIL, so they run side by side on a small thread pool
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        grids_job = pool.submit(build_time_grids, filtered_df)
+        grouped = filtered_df.groupby(['page', 'device', 'country', 'date_only'], observed=True).agg(**FUSED_AGGREGATIONS)
+        
+        jobs = {
+            'page': pool.submit(analyze_page_performance, grouped),
+            'device': pool.submit(analyze_device_performance, grouped),
+            'country': pool.submit(analyze_country_performance, grouped),
+            'daily': pool.submit(analyze_time_trends, grouped)
+        }
+        grids = grids_job.result()
+        
+        stats = {
+            'records': len(filtered_df),
+            'kpis': calculate_kpis(grouped),
+            'heatmap': build_heatmap(grids),
+            'hourly': analyze_hourly_patterns(grids),
+            'weekday': analyze_weekday_patterns(grids)
+        }
+        stats.update({name: job.result() for name, job in jobs.items()})
+    
+    return stats
+
+# Report export
+@st.cache_resource
+def get_export_executor():
+    """Background worker shared by all sessions, so exports don't block a rerun"""
+    return ThreadPoolExecutor(max_workers=1)
+
+def export_report(report_data, path):
+    """Write each report frame to its own worksheet"""
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        for sheet_name, data in report_data.items():
+            data.to_excel(writer, sheet_name=sheet_name, index=False)
+
+# Per-session figure cache
+def cached_figure(name, filter_key, builder):
+    """Return the figure built for this chart and filter, building it only on a miss"""
+    figures = st.session_state.setdefault('_figures', {})
+    key = (name, filter_key)
+    if key in figures:
+        # Re-insert so the dict stays in least-recently-used order
+        figures[key] = figures.pop(key)
+    else:
+        figures[key] = builder()
+        while len(figures) > MAX_CACHED_FIGURES:
+            figures.pop(next(iter(figures)))
+    return figures[key]
+
 # Main application
 def main():
     st.markdown('<p class="main-header">🚀 Web Traffic Analytics Dashboard</p>', unsafe_allow_html=True)
@@ -186,53 +425,72 @@ def main():
     # Sidebar filters
     st.sidebar.header("📊 Filters")
     
+    # Widget bounds and options come from the datetime column and the categorical
+    # categories, so reruns don't rescan the rows for them
+    min_date, max_date = df['date'].min().date(), df['date'].max().date()
+    page_options = sorted(df['page'].cat.categories)
+    device_options = sorted(df['device'].cat.categories)
+    country_options = sorted(df['country'].cat.categories)
+    
     date_range = st.sidebar.date_input(
         "Date Range",
-        value=(df['date_only'].min(), df['date_only'].max()),
-        min_value=df['date_only'].min(),
-        max_value=df['date_only'].max()
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date
     )
     
     selected_pages = st.sidebar.multiselect(
         "Select Pages",
-        options=sorted(df['page'].unique()),
-        default=sorted(df['page'].unique())
+        options=page_options,
+        default=page_options
     )
     
     selected_devices = st.sidebar.multiselect(
         "Select Devices",
-        options=sorted(df['device'].unique()),
-        default=sorted(df['device'].unique())
+        options=device_options,
+        default=device_options
     )
     
     selected_countries = st.sidebar.multiselect(
         "Select Countries",
-        options=sorted(df['country'].unique()),
-        default=sorted(df['country'].unique())
+        options=country_options,
+        default=country_options
     )
     
     # --- Safe Filter Section ---
     # Check that the user selected both start and end dates
     if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
-        mask = (
-            (df['date_only'] >= date_range[0]) &
-            (df['date_only'] <= date_range[1]) &
-            (df['page'].isin(selected_pages)) &
-            (df['device'].isin(selected_devices)) &
-            (df['country'].isin(selected_countries))
+        filter_key = (
+            date_range[0],
+            date_range[1],
+            tuple(sorted(selected_pages)),
+            tuple(sorted(selected_devices)),
+            tuple(sorted(selected_countries))
         )
-        filtered_df = df[mask]
-
-        if filtered_df.empty:
-            st.warning("No data available for the selected filters. Please adjust your selection.")
-            return
+        
+        # Everything selected is the default view: skip masking and share the unfiltered stats
+        full_selection = (
+            date_range[0] <= min_date and date_range[1] >= max_date and
+            len(selected_pages) == len(page_options) and
+            len(selected_devices) == len(device_options) and
+            len(selected_countries) == len(country_options)
+        )
+        if full_selection:
+            filter_key = (None, None, None, None, None)
     else:
         st.warning("⚠️ Please select both a start and an end date to view the data.")
-        filtered_df = df.copy()
+        filter_key = (None, None, None, None, None)
 
+    # Filter and aggregate everything used across tabs in one pass, cached on the
+    # selection itself, so a rerun with an unchanged filter never touches the rows
+    stats = compute_all_stats(*filter_key)
+    
+    if stats['records'] == 0:
+        st.warning("No data available for the selected filters. Please adjust your selection.")
+        return
     
     # Calculate KPIs
-    kpis = calculate_kpis(filtered_df)
+    kpis = stats['kpis']
     
     # Display KPIs
     st.header("📈 Key Performance Indicators")
@@ -269,116 +527,144 @@ def main():
         
         with col1:
             # Daily trend
-            daily_stats = analyze_time_trends(filtered_df)
-            fig_trend = go.Figure()
-            fig_trend.add_trace(go.Scatter(
-                x=daily_stats['date_only'],
-                y=daily_stats['sessions'],
-                mode='lines+markers',
-                name='Sessions',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig_trend.update_layout(
-                title="Daily Sessions Trend",
-                xaxis_title="Date",
-                yaxis_title="Sessions",
-                hovermode='x unified',
-                height=400
-            )
+            daily_stats = stats['daily']
+            
+            def build_daily_trend_chart():
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=daily_stats['date_only'],
+                    y=daily_stats['sessions'],
+                    mode='lines+markers',
+                    name='Sessions',
+                    line=dict(color='#1f77b4', width=2)
+                ))
+                fig.update_layout(
+                    title="Daily Sessions Trend",
+                    xaxis_title="Date",
+                    yaxis_title="Sessions",
+                    hovermode='x unified',
+                    height=400
+                )
+                return fig
+            
+            fig_trend = cached_figure('daily_trend', filter_key, build_daily_trend_chart)
             st.plotly_chart(fig_trend, use_container_width=True)
         
         with col2:
             # Conversion rate trend
-            fig_conv = go.Figure()
-            fig_conv.add_trace(go.Scatter(
-                x=daily_stats['date_only'],
-                y=daily_stats['conversion_rate'],
-                mode='lines+markers',
-                name='Conversion Rate',
-                line=dict(color='#2ca02c', width=2),
-                fill='tozeroy'
-            ))
-            fig_conv.update_layout(
-                title="Daily Conversion Rate Trend",
-                xaxis_title="Date",
-                yaxis_title="Conversion Rate (%)",
-                hovermode='x unified',
-                height=400
-            )
+            def build_daily_conversion_chart():
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=daily_stats['date_only'],
+                    y=daily_stats['conversion_rate'],
+                    mode='lines+markers',
+                    name='Conversion Rate',
+                    line=dict(color='#2ca02c', width=2),
+                    fill='tozeroy'
+                ))
+                fig.update_layout(
+                    title="Daily Conversion Rate Trend",
+                    xaxis_title="Date",
+                    yaxis_title="Conversion Rate (%)",
+                    hovermode='x unified',
+                    height=400
+                )
+                return fig
+            
+            fig_conv = cached_figure('daily_conversion', filter_key, build_daily_conversion_chart)
             st.plotly_chart(fig_conv, use_container_width=True)
         
         col3, col4 = st.columns(2)
         
         with col3:
             # Page distribution
-            page_sessions = filtered_df.groupby('page')['sessions'].sum().sort_values(ascending=False)
-            fig_pages = px.pie(
-                values=page_sessions.values,
-                names=page_sessions.index,
-                title="Traffic Distribution by Page"
-            )
-            fig_pages.update_traces(textposition='inside', textinfo='percent+label')
+            page_sessions = stats['page'].set_index('page')['sessions'].sort_values(ascending=False)
+            
+            def build_page_distribution_chart():
+                fig = px.pie(
+                    values=page_sessions.values,
+                    names=page_sessions.index,
+                    title="Traffic Distribution by Page"
+                )
+                fig.update_traces(textposition='inside', textinfo='percent+label')
+                return fig
+            
+            fig_pages = cached_figure('page_distribution', filter_key, build_page_distribution_chart)
             st.plotly_chart(fig_pages, use_container_width=True)
         
         with col4:
             # Device distribution
-            device_sessions = filtered_df.groupby('device')['sessions'].sum()
-            fig_device = px.bar(
-                x=device_sessions.index,
-                y=device_sessions.values,
-                title="Traffic by Device Type",
-                labels={'x': 'Device', 'y': 'Sessions'},
-                color=device_sessions.values,
-                color_continuous_scale='Blues'
-            )
+            device_sessions = stats['device'].set_index('device')['sessions']
+            
+            def build_device_distribution_chart():
+                fig = px.bar(
+                    x=device_sessions.index,
+                    y=device_sessions.values,
+                    title="Traffic by Device Type",
+                    labels={'x': 'Device', 'y': 'Sessions'},
+                    color=device_sessions.values,
+                    color_continuous_scale='Blues'
+                )
+                return fig
+            
+            fig_device = cached_figure('device_distribution', filter_key, build_device_distribution_chart)
             st.plotly_chart(fig_device, use_container_width=True)
     
     with tab2:
         st.header("Page Performance Analysis")
         
-        page_stats = analyze_page_performance(filtered_df)
+        page_stats = stats['page']
         
         # Performance matrix
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_matrix = px.scatter(
-                page_stats,
-                x='sessions',
-                y='conversion_rate',
-                size='quality_score',
-                color='category',
-                hover_data=['page', 'bounce_rate', 'avg_session_duration'],
-                title="Page Performance Matrix",
-                labels={
-                    'sessions': 'Total Sessions',
-                    'conversion_rate': 'Conversion Rate (%)',
-                    'quality_score': 'Quality Score'
-                },
-                color_discrete_map={
-                    'Star Performers': '#2ca02c',
-                    'High Traffic - Low Conversion': '#ff7f0e',
-                    'Hidden Gems': '#1f77b4',
-                    'Needs Attention': '#d62728'
-                }
-            )
-            fig_matrix.update_layout(height=500)
+            def build_page_matrix_chart():
+                fig = px.scatter(
+                    page_stats,
+                    x='sessions',
+                    y='conversion_rate',
+                    size='quality_score',
+                    color='category',
+                    hover_data=['page', 'bounce_rate', 'avg_session_duration'],
+                    title="Page Performance Matrix",
+                    labels={
+                        'sessions': 'Total Sessions',
+                        'conversion_rate': 'Conversion Rate (%)',
+                        'quality_score': 'Quality Score'
+                    },
+                    color_discrete_map={
+                        'Star Performers': '#2ca02c',
+                        'High Traffic - Low Conversion': '#ff7f0e',
+                        'Hidden Gems': '#1f77b4',
+                        'Needs Attention': '#d62728'
+                    }
+                )
+                fig.update_layout(height=500)
+                return fig
+            
+            fig_matrix = cached_figure('page_matrix', filter_key, build_page_matrix_chart)
             st.plotly_chart(fig_matrix, use_container_width=True)
         
         with col2:
             # Top performing pages
-            top_pages = page_stats.nlargest(10, 'quality_score')
-            fig_top = px.bar(
-                top_pages,
-                x='quality_score',
-                y='page',
-                orientation='h',
-                title="Top 10 Pages by Quality Score",
-                labels={'quality_score': 'Quality Score', 'page': 'Page'},
-                color='quality_score',
-                color_continuous_scale='Greens'
-            )
-            fig_top.update_layout(height=500)
+            top_pages = top_rows(page_stats, 10, 'quality_score')
+            
+            def build_top_pages_chart():
+                fig = px.bar(
+                    top_pages,
+                    x='quality_score',
+                    y='page',
+                    orientation='h',
+                    title="Top 10 Pages by Quality Score",
+                    labels={'quality_score': 'Quality Score', 'page': 'Page'},
+                    color='quality_score',
+                    color_continuous_scale='Greens'
+                )
+                fig.update_layout(height=500)
+                return fig
+            
+            fig_top = cached_figure('top_pages', filter_key, build_top_pages_chart)
             st.plotly_chart(fig_top, use_container_width=True)
         
         # Detailed table
@@ -403,26 +689,30 @@ def main():
         
         with col1:
             st.subheader("Device Performance")
-            device_stats = analyze_device_performance(filtered_df)
+            device_stats = stats['device']
             
-            fig_device_perf = go.Figure()
-            fig_device_perf.add_trace(go.Bar(
-                x=device_stats['device'],
-                y=device_stats['sessions'],
-                name='Sessions',
-                marker_color='lightblue'
-            ))
-            fig_device_perf.add_trace(go.Bar(
-                x=device_stats['device'],
-                y=device_stats['conversions'],
-                name='Conversions',
-                marker_color='darkblue'
-            ))
-            fig_device_perf.update_layout(
-                title="Sessions vs Conversions by Device",
-                barmode='group',
-                height=400
-            )
+            def build_device_performance_chart():
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    x=device_stats['device'],
+                    y=device_stats['sessions'],
+                    name='Sessions',
+                    marker_color='lightblue'
+                ))
+                fig.add_trace(go.Bar(
+                    x=device_stats['device'],
+                    y=device_stats['conversions'],
+                    name='Conversions',
+                    marker_color='darkblue'
+                ))
+                fig.update_layout(
+                    title="Sessions vs Conversions by Device",
+                    barmode='group',
+                    height=400
+                )
+                return fig
+            
+            fig_device_perf = cached_figure('device_performance', filter_key, build_device_performance_chart)
             st.plotly_chart(fig_device_perf, use_container_width=True)
             
             st.dataframe(device_stats.style.format({
@@ -433,17 +723,21 @@ def main():
         
         with col2:
             st.subheader("Country Performance")
-            country_stats = analyze_country_performance(filtered_df)
+            country_stats = stats['country']
             
-            fig_country = px.bar(
-                country_stats.sort_values('sessions', ascending=False).head(10),
-                x='country',
-                y='sessions',
-                title="Top 10 Countries by Sessions",
-                color='conversion_rate',
-                color_continuous_scale='Viridis'
-            )
-            fig_country.update_layout(height=400)
+            def build_country_sessions_chart():
+                fig = px.bar(
+                    country_stats.sort_values('sessions', ascending=False).head(10),
+                    x='country',
+                    y='sessions',
+                    title="Top 10 Countries by Sessions",
+                    color='conversion_rate',
+                    color_continuous_scale='Viridis'
+                )
+                fig.update_layout(height=400)
+                return fig
+            
+            fig_country = cached_figure('country_sessions', filter_key, build_country_sessions_chart)
             st.plotly_chart(fig_country, use_container_width=True)
             
             st.dataframe(country_stats.sort_values('sessions', ascending=False).style.format({
@@ -459,83 +753,71 @@ def main():
         
         with col1:
             # Hourly heatmap
-            hourly_stats = filtered_df.groupby(['day_of_week', 'hour'])['sessions'].sum().reset_index()
-            hourly_pivot = hourly_stats.pivot(index='day_of_week', columns='hour', values='sessions')
-            
-            # Reorder days
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            hourly_pivot = hourly_pivot.reindex([d for d in day_order if d in hourly_pivot.index])
+            def build_heatmap_chart():
+                fig = px.imshow(
+                    stats['heatmap'],
+                    title="Traffic Heatmap: Day of Week vs Hour",
+                    labels=dict(x="Hour of Day", y="Day of Week", color="Sessions"),
+                    color_continuous_scale='Blues'
+                )
+                return fig
             
-            fig_heatmap = px.imshow(
-                hourly_pivot,
-                title="Traffic Heatmap: Day of Week vs Hour",
-                labels=dict(x="Hour of Day", y="Day of Week", color="Sessions"),
-                color_continuous_scale='Blues'
-            )
+            fig_heatmap = cached_figure('heatmap', filter_key, build_heatmap_chart)
             st.plotly_chart(fig_heatmap, use_container_width=True)
         
         with col2:
             # Hour of day performance
-            hourly_perf = filtered_df.groupby('hour').agg({
-                'sessions': 'sum',
-                'conversions': 'sum',
-                'bounce_rate': 'mean'
-            }).reset_index()
-            hourly_perf['conversion_rate'] = (hourly_perf['conversions'] / hourly_perf['sessions'] * 100)
+            hourly_perf = stats['hourly']
             
-            fig_hourly = make_subplots(specs=[[{"secondary_y": True}]])
-            fig_hourly.add_trace(
-                go.Bar(x=hourly_perf['hour'], y=hourly_perf['sessions'], name='Sessions'),
-                secondary_y=False
-            )
-            fig_hourly.add_trace(
-                go.Scatter(x=hourly_perf['hour'], y=hourly_perf['conversion_rate'], 
-                          name='Conversion Rate', mode='lines+markers', line=dict(color='red')),
-                secondary_y=True
-            )
-            fig_hourly.update_xaxes(title_text="Hour of Day")
-            fig_hourly.update_yaxes(title_text="Sessions", secondary_y=False)
-            fig_hourly.update_yaxes(title_text="Conversion Rate (%)", secondary_y=True)
-            fig_hourly.update_layout(title="Hourly Performance")
+            def build_hourly_chart():
+                fig = make_subplots(specs=[[{"secondary_y": True}]])
+                fig.add_trace(
+                    go.Bar(x=hourly_perf['hour'], y=hourly_perf['sessions'], name='Sessions'),
+                    secondary_y=False
+                )
+                fig.add_trace(
+                    go.Scatter(x=hourly_perf['hour'], y=hourly_perf['conversion_rate'], 
+                              name='Conversion Rate', mode='lines+markers', line=dict(color='red')),
+                    secondary_y=True
+                )
+                fig.update_xaxes(title_text="Hour of Day")
+                fig.update_yaxes(title_text="Sessions", secondary_y=False)
+                fig.update_yaxes(title_text="Conversion Rate (%)", secondary_y=True)
+                fig.update_layout(title="Hourly Performance")
+                return fig
+            
+            fig_hourly = cached_figure('hourly', filter_key, build_hourly_chart)
             st.plotly_chart(fig_hourly, use_container_width=True)
         
-        # Day of week analysis
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        dow_stats = filtered_df.groupby('day_of_week').agg({
-            'sessions': 'sum',
-            'conversions': 'sum',
-            'bounce_rate': 'mean'
-        }).reset_index()
-        dow_stats['conversion_rate'] = (dow_stats['conversions'] / dow_stats['sessions'] * 100)
-        dow_stats['day_of_week'] = pd.Categorical(
-            dow_stats['day_of_week'], 
-            categories=day_order, 
-            ordered=True
-        )
-        dow_stats = dow_stats.sort_values('day_of_week')
-        
-        fig_dow = px.bar(
-            dow_stats,
-            x='day_of_week',
-            y='sessions',
-            title="Traffic by Day of Week",
-            color='conversion_rate',
-            color_continuous_scale='RdYlGn'
-        )
+        # Day of week analysis (already in Monday-Sunday order)
+        dow_stats = stats['weekday']
+        
+        def build_weekday_chart():
+            fig = px.bar(
+                dow_stats,
+                x='day_of_week',
+                y='sessions',
+                title="Traffic by Day of Week",
+                color='conversion_rate',
+                color_continuous_scale='RdYlGn'
+            )
+            return fig
+        
+        fig_dow = cached_figure('weekday', filter_key, build_weekday_chart)
         st.plotly_chart(fig_dow, use_container_width=True)
     
     with tab5:
         st.header("🎯 Key Insights & Recommendations")
         
-        page_stats = analyze_page_performance(filtered_df)
-        device_stats = analyze_device_performance(filtered_df)
+        page_stats = stats['page']
+        device_stats = stats['device']
         
         # Generate insights
         st.markdown('<div class="insight-box">', unsafe_allow_html=True)
         st.subheader("📊 Traffic Insights")
         
         # Top performing page
-        best_page = page_stats.nlargest(1, 'quality_score').iloc[0]
+        best_page = page_stats.iloc[np.nanargmax(page_stats['quality_score'].values)]
         st.success(f"**Star Performer**: {best_page['page']} page has the highest quality score ({best_page['quality_score']:.1f}) with {best_page['sessions']:,.0f} sessions and {best_page['conversion_rate']:.2f}% conversion rate.")
         
         # Pages needing attention
@@ -544,7 +826,7 @@ def main():
             st.warning(f"**⚠️ Attention Required**: {len(needs_attention)} pages need optimization. Focus on improving '{needs_attention.iloc[0]['page']}' which has high bounce rate.")
         
         # Device insights
-        best_device = device_stats.nlargest(1, 'conversion_rate').iloc[0]
+        best_device = device_stats.iloc[np.nanargmax(device_stats['conversion_rate'].values)]
         st.info(f"**Best Converting Device**: {best_device['device']} users convert at {best_device['conversion_rate']:.2f}%, consider optimizing other devices.")
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -571,26 +853,22 @@ def main():
             )
         
         # High bounce rate
-        high_bounce = page_stats.nlargest(3, 'bounce_rate')
+        high_bounce = page_stats.iloc[np.nanargmax(page_stats['bounce_rate'].values)]
         recommendations.append(
-            f"3. **Reduce Bounce Rates**: Focus on {high_bounce.iloc[0]['page']} page (bounce rate: {high_bounce.iloc[0]['bounce_rate']*100:.1f}%). "
+            f"3. **Reduce Bounce Rates**: Focus on {high_bounce['page']} page (bounce rate: {high_bounce['bounce_rate']*100:.1f}%). "
             f"Improve page load speed, content relevance, and clear CTAs."
         )
         
         # Device optimization
-        worst_device = device_stats.nsmallest(1, 'conversion_rate').iloc[0]
+        worst_device = device_stats.iloc[np.nanargmin(device_stats['conversion_rate'].values)]
         recommendations.append(
             f"4. **Device Optimization**: {worst_device['device']} users have the lowest conversion rate ({worst_device['conversion_rate']:.2f}%). "
             f"Ensure responsive design and test user experience on this device type."
         )
         
         # Time-based recommendation
-        hourly_perf = filtered_df.groupby('hour').agg({
-            'sessions': 'sum',
-            'conversions': 'sum'
-        }).reset_index()
-        hourly_perf['conversion_rate'] = (hourly_perf['conversions'] / hourly_perf['sessions'] * 100)
-        best_hour = hourly_perf.nlargest(1, 'conversion_rate').iloc[0]
+        hourly_perf = stats['hourly']
+        best_hour = hourly_perf.iloc[np.nanargmax(hourly_perf['conversion_rate'].values)]
         recommendations.append(
             f"5. **Timing Strategy**: Peak conversion times are around {int(best_hour['hour'])}:00. "
             f"Schedule marketing campaigns and promotions during these high-converting hours."
@@ -606,14 +884,29 @@ def main():
             report_data = {
                 'Page Performance': page_stats,
                 'Device Analysis': device_stats,
-                'Daily Trends': analyze_time_trends(filtered_df)
+                'Daily Trends': stats['daily']
             }
             
-            with pd.ExcelWriter('analytics_report.xlsx', engine='openpyxl') as writer:
-                for sheet_name, data in report_data.items():
-                    data.to_excel(writer, sheet_name=sheet_name, index=False)
+            export_job = get_export_executor().submit(export_report, report_data, EXPORT_FILENAME)
+            st.session_state['export_job'] = export_job
             
-            st.success("✅ Report exported successfully as 'analytics_report.xlsx'!")
+            # Small reports finish almost immediately; larger ones keep writing in the background
+            wait([export_job], timeout=1)
+        
+        export_job = st.session_state.get('export_job')
+        if export_job is not None:
+            if not export_job.done():
+                st.info("⏳ Exporting report in the background...")
+                
+                # Poll: the page is already drawn, so give the job up to a second and rerun to check again
+                wait([export_job], timeout=1)
+                st.rerun()
+            else:
+                del st.session_state['export_job']
+                if export_job.exception() is not None:
+                    st.error(f"Error exporting report: {str(export_job.exception())}")
+                else:
+                    st.success(f"✅ Report exported successfully as '{EXPORT_FILENAME}'!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
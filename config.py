@@ -10,6 +10,23 @@ Centralized settings for easy customization
 DATA_FILE = 'web_traffic_data.csv'
 DATE_FORMAT = '%d-%m-%Y %H:%M'
 
+# Parsed copy of DATA_FILE (typed columns + derived date fields), rebuilt
+# automatically whenever the CSV, COLUMN_DTYPES or the derived columns change
+PARQUET_FILE = 'web_traffic_data.parquet'
+
+# Column dtypes applied while reading the CSV
+# (categories turn groupby keys into small integer codes)
+COLUMN_DTYPES = {
+    'page': 'category',
+    'device': 'category',
+    'country': 'category',
+    'sessions': 'int32',
+    'users': 'int32',
+    'conversions': 'int32',
+    'bounce_rate': 'float32',
+    'avg_session_duration': 'float32'
+}
+
 # Required columns in the dataset
 REQUIRED_COLUMNS = [
     'date', 'page', 'device', 'country',
@@ -113,9 +130,21 @@ EXPORT_SHEETS = [
 CACHE_TTL = 3600  # Cache time-to-live in seconds (1 hour)
 MAX_CACHE_ENTRIES = 1000
 
+# Plotly figures kept per browser session (keyed on chart + filter selection)
+MAX_CACHED_FIGURES = 32
+
 # Data loading optimization
 CHUNK_SIZE = 10000  # For processing large files
 
+# Rows per chunk for `data_validator.py --stream`: large enough that the per-chunk
+# merging (category tallies, duplicate hashes) is amortized, small enough to bound memory
+STREAM_CHUNK_SIZE = 1_000_000
+
+# Parsed copies of validated CSVs (Arrow IPC files, memory-mapped on reload):
+# one per source path, rebuilt when its modification time, size or COLUMN_DTYPES
+# change (pass --no-cache to skip it)
+VALIDATOR_CACHE_DIR = '.cache/validator'
+
 # ============================================================================
 # ALERT THRESHOLDS
 # ============================================================================
@@ -6,7 +6,37 @@ Validates and cleans web traffic data before analysis
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import os
 import sys
+import warnings
+from config import COLUMN_DTYPES, STREAM_CHUNK_SIZE, DATE_FORMAT, VALIDATOR_CACHE_DIR
+
+# PyArrow's multi-threaded CSV reader is optional; pandas' C engine is the fallback
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    from pyarrow import parquet as pq
+except ImportError:
+    pa = pa_csv = pq = None
+
+# cuDF parses CSVs on the GPU for --gpu; hosts without it use the PyArrow reader
+try:
+    import cudf
+except ImportError:
+    cudf = None
+
+NUMERIC_COLUMNS = ['sessions', 'users', 'conversions', 'bounce_rate', 'avg_session_duration']
+CATEGORICAL_COLUMNS = ['page', 'device', 'country']
+
+# CSVs larger than this are memory-mapped for the PyArrow reader instead of read through a buffer
+MMAP_THRESHOLD = 256 << 20
+
+# Frames with fewer rows than this run the per-column numeric checks on one thread
+PARALLEL_MIN_ROWS = 100_000
 
 class DataValidator:
     """Validates and preprocesses web traffic data"""
@@ -15,21 +45,122 @@ class DataValidator:
         self.filepath = filepath
         self.df = None
         self.issues = []
-        
-    def load_data(self):
+        self._hashes = None  # row hashes from check_data_quality, reused by clean_data
+        self._numeric = None  # numeric pass from validate_numeric_columns, reused for the summary
+        self._log = io.StringIO()  # report text, written to stdout in one go by _flush
+        
+    def _write(self, text=""):
+        """Buffer one line of the report"""
+        self._log.write(text)
+        self._log.write("\n")
+    
+    def _flush(self):
+        """Write the buffered report to stdout and clear the buffer"""
+        sys.stdout.write(self._log.getvalue())
+        sys.stdout.flush()
+        self._log.seek(0)
+        self._log.truncate(0)
+    
+    def _read_typed_csv(self, engine):
+        """Read the CSV with the dashboard's column dtypes (categorical dimensions, 32-bit metrics)"""
+        if engine == 'cudf' and cudf is not None:
+            # Parse on the device, then hand the frame to the host-side numpy checks
+            dtypes = dict(COLUMN_DTYPES, date='str')
+            return cudf.read_csv(self.filepath, dtype=dtypes).to_pandas()
+        
+        if engine in ('pyarrow', 'cudf') and pa_csv is not None:
+            arrow_types = {
+                'category': pa.dictionary(pa.int32(), pa.string()),
+                'int32': pa.int32(),
+                'float32': pa.float32()
+            }
+            column_types = {col: arrow_types[dtype] for col, dtype in COLUMN_DTYPES.items()}
+            column_types['date'] = pa.string()  # parsed (and reported on) in validate_dates
+            
+            read_options = pa_csv.ReadOptions(block_size=64 << 20, use_threads=True)
+            # Empty and NA-like cells are missing in the dimension columns too, as in pandas
+            convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+            
+            if os.path.getsize(self.filepath) > MMAP_THRESHOLD:
+                # Let the parser threads fault pages in straight from the page cache
+                # rather than copying the file through read() buffers
+                with pa.memory_map(self.filepath, 'r') as source:
+                    table = pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+            else:
+                table = pa_csv.read_csv(self.filepath, read_options=read_options, convert_options=convert_options)
+            return table.to_pandas()
+        
+        return pd.read_csv(self.filepath, engine='c', low_memory=False, dtype=COLUMN_DTYPES)
+    
+    def _cache_path(self):
+        """Cache file for the parsed CSV: one per source path, overwritten when the file changes"""
+        name = hashlib.sha1(os.path.abspath(self.filepath).encode()).hexdigest()
+        return os.path.join(VALIDATOR_CACHE_DIR, name + '.arrow')
+    
+    def _cache_key(self):
+        """What the cached copy must match: the CSV's modification time and size and the schema"""
+        stat = os.stat(self.filepath)
+        return f"{stat.st_mtime_ns}:{stat.st_size}:{COLUMN_DTYPES}".encode()
+    
+    def _read_cache(self, cache_path, key):
+        """Load the cached frame from its memory-mapped Arrow IPC file (None if missing, stale or unreadable)"""
+        try:
+            with pa.memory_map(cache_path, 'r') as source:
+                reader = pa.ipc.open_file(source)
+                if (reader.schema.metadata or {}).get(b'source_key') != key:
+                    return None
+                return reader.read_all().to_pandas()
+        except (OSError, ValueError):
+            return None
+    
+    def _write_cache(self, cache_path, key):
+        """Store the parsed frame as an uncompressed Arrow IPC file, ready to be memory-mapped"""
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b'source_key': key})
+        os.makedirs(VALIDATOR_CACHE_DIR, exist_ok=True)
+        
+        # Write to a temporary name first so a half-written file is never picked up
+        with pa.OSFile(cache_path + '.tmp', 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(cache_path + '.tmp', cache_path)
+    
+    def load_data(self, engine='pyarrow', use_cache=True):
         """Load CSV file"""
+        self._hashes = self._numeric = None
         try:
-            self.df = pd.read_csv(self.filepath)
-            print(f"✓ Successfully loaded {len(self.df):,} records")
+            if self.filepath.endswith('.parquet'):
+                # Cleaned output from clean_data(output_format='parquet') is already typed
+                self.df = pd.read_parquet(self.filepath, engine='pyarrow')
+            else:
+                cache_path, key = self._cache_path(), self._cache_key()
+                
+                # An unchanged file was already parsed on an earlier run
+                use_cache = use_cache and pa is not None
+                self.df = self._read_cache(cache_path, key) if use_cache else None
+                if self.df is None:
+                    try:
+                        self.df = self._read_typed_csv(engine)
+                    except ValueError:
+                        # Values that don't fit the schema (e.g. text in a numeric column):
+                        # load the metrics untyped so the validation steps can report them
+                        self.df = pd.read_csv(self.filepath, dtype={col: 'category' for col in CATEGORICAL_COLUMNS})
+                    
+                    if use_cache:
+                        try:
+                            self._write_cache(cache_path, key)
+                        except (OSError, ValueError):
+                            pass  # read-only checkout or mixed-type columns: just parse again next time
+            self._write(f"✓ Successfully loaded {len(self.df):,} records")
             return True
         except FileNotFoundError:
-            print(f"✗ Error: File '{self.filepath}' not found")
+            self._write(f"✗ Error: File '{self.filepath}' not found")
             return False
         except Exception as e:
-            print(f"✗ Error loading file: {str(e)}")
+            self._write(f"✗ Error loading file: {str(e)}")
             return False
     
-    def validate_columns(self):
+    def validate_columns(self, columns=None):
         """Check if all required columns exist"""
         required_columns = [
             'date', 'page', 'device', 'country', 
@@ -37,184 +168,373 @@ class DataValidator:
             'conversions', 'avg_session_duration'
         ]
         
-        missing_columns = set(required_columns) - set(self.df.columns)
+        if columns is None:
+            columns = self.df.columns
+        
+        missing_columns = set(required_columns) - set(columns)
         
         if missing_columns:
-            print(f"✗ Missing columns: {missing_columns}")
+            self._write(f"✗ Missing columns: {missing_columns}")
             self.issues.append(f"Missing columns: {missing_columns}")
             return False
         
-        print("✓ All required columns present")
+        self._write("✓ All required columns present")
         return True
     
-    def validate_dates(self):
+    def _parse_dates(self, dates):
+        """Parse a date column in the DD-MM-YYYY HH:MM format"""
+        # Timestamps repeat a lot (one per row per minute), so cache the conversions;
+        # second resolution is all the format carries
+        return pd.to_datetime(dates, format=DATE_FORMAT, cache=True, exact=True).astype('datetime64[s]')
+    
+    def _date_counts(self, dates):
+        """Future-date count and range of a parsed date column"""
+        now = np.datetime64(datetime.now(), 's')
+        return {
+            'future': np.count_nonzero(dates.to_numpy() > now),
+            'min': dates.min(),
+            'max': dates.max()
+        }
+    
+    def validate_dates(self, counts=None, error=None):
         """Validate date format and values"""
         try:
-            # Try parsing dates
-            self.df['date'] = pd.to_datetime(self.df['date'], format='%d-%m-%Y %H:%M')
-            
-            # Check for future dates
-            future_dates = self.df[self.df['date'] > datetime.now()]
-            if len(future_dates) > 0:
-                print(f"⚠ Warning: {len(future_dates)} records have future dates")
-                self.issues.append(f"{len(future_dates)} future dates found")
-            
-            print(f"✓ Date range: {self.df['date'].min()} to {self.df['date'].max()}")
-            return True
-            
+            if counts is None and error is None:
+                # Try parsing dates
+                self.df['date'] = self._parse_dates(self.df['date'])
+                counts = self._date_counts(self.df['date'])
         except Exception as e:
-            print(f"✗ Date parsing error: {str(e)}")
-            print("  Expected format: DD-MM-YYYY HH:MM")
-            self.issues.append(f"Date parsing error: {str(e)}")
+            error = e
+        
+        if error is not None:
+            self._write(f"✗ Date parsing error: {str(error)}")
+            self._write("  Expected format: DD-MM-YYYY HH:MM")
+            self.issues.append(f"Date parsing error: {str(error)}")
             return False
+        
+        # Check for future dates
+        if counts['future'] > 0:
+            self._write(f"⚠ Warning: {counts['future']} records have future dates")
+            self.issues.append(f"{counts['future']} future dates found")
+        
+        self._write(f"✓ Date range: {counts['min']} to {counts['max']}")
+        return True
     
-    def validate_numeric_columns(self):
+    def _numeric_column_counts(self, col, values):
+        """Checks and totals for one numeric column in one pass over it"""
+        col_counts = {'negative': 0, 'invalid_bounce': 0, 'missing': 0, 'sum': 0, 'count': len(values)}
+        
+        # Every comparison writes into one reused boolean buffer instead of a new temporary
+        mask = np.empty(len(values), dtype=bool)
+        
+        # Below 0 and above 1 are disjoint, so the bounce_rate range check is two counts added
+        below_zero = np.count_nonzero(np.less(values, 0, out=mask))
+        if col == 'bounce_rate':
+            col_counts['invalid_bounce'] = below_zero + np.count_nonzero(np.greater(values, 1, out=mask))
+        else:
+            col_counts['negative'] = below_zero
+        
+        # Integer columns can't hold NaN; for floats the NaN mask is flipped in place and
+        # used as the sum's where= (no NaN-free copy like nansum makes), accumulated in float64
+        if values.dtype.kind == 'f':
+            col_counts['missing'] = np.count_nonzero(np.isnan(values, out=mask))
+            col_counts['sum'] = np.add.reduce(values, where=np.logical_not(mask, out=mask), dtype=np.float64)
+        else:
+            col_counts['sum'] = values.sum(dtype=np.int64)  # int32 columns, 64-bit total
+        col_counts['count'] -= col_counts['missing']
+        
+        return col_counts
+    
+    def _numeric_counts(self, df):
+        """Checks and totals per numeric column (None if not numeric)"""
+        counts = {col: None for col in NUMERIC_COLUMNS}
+        columns = [col for col in NUMERIC_COLUMNS if pd.api.types.is_numeric_dtype(df[col])]
+        arrays = [df[col].to_numpy(copy=False) for col in columns]
+        
+        # The numpy kernels release the GIL, so large frames check the columns side by side;
+        # for small ones (e.g. streamed chunks) starting the threads costs more than it saves
+        if len(df) < PARALLEL_MIN_ROWS:
+            counts.update(zip(columns, map(self._numeric_column_counts, columns, arrays)))
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(NUMERIC_COLUMNS), os.cpu_count() or 1)) as pool:
+                counts.update(zip(columns, pool.map(self._numeric_column_counts, columns, arrays)))
+        
+        return counts
+    
+    def validate_numeric_columns(self, counts=None):
         """Validate numeric columns"""
-        numeric_cols = ['sessions', 'users', 'conversions', 
-                       'bounce_rate', 'avg_session_duration']
+        if counts is None:
+            counts = self._numeric = self._numeric_counts(self.df)
         
         all_valid = True
         
-        for col in numeric_cols:
+        for col in NUMERIC_COLUMNS:
             # Check if numeric
-            if not pd.api.types.is_numeric_dtype(self.df[col]):
-                print(f"✗ Column '{col}' is not numeric")
+            if counts[col] is None:
+                self._write(f"✗ Column '{col}' is not numeric")
                 self.issues.append(f"'{col}' is not numeric")
                 all_valid = False
                 continue
             
             # Check for negative values (except bounce_rate which can be 0-1)
-            if col != 'bounce_rate':
-                negative_count = (self.df[col] < 0).sum()
-                if negative_count > 0:
-                    print(f"⚠ Warning: {negative_count} negative values in '{col}'")
-                    self.issues.append(f"{negative_count} negative values in '{col}'")
+            negative_count = counts[col]['negative']
+            if negative_count > 0:
+                self._write(f"⚠ Warning: {negative_count} negative values in '{col}'")
+                self.issues.append(f"{negative_count} negative values in '{col}'")
             
             # Check bounce_rate range
-            if col == 'bounce_rate':
-                invalid_bounce = ((self.df[col] < 0) | (self.df[col] > 1)).sum()
-                if invalid_bounce > 0:
-                    print(f"⚠ Warning: {invalid_bounce} invalid bounce_rate values (should be 0-1)")
-                    self.issues.append(f"{invalid_bounce} invalid bounce_rate values")
+            invalid_bounce = counts[col]['invalid_bounce']
+            if invalid_bounce > 0:
+                self._write(f"⚠ Warning: {invalid_bounce} invalid bounce_rate values (should be 0-1)")
+                self.issues.append(f"{invalid_bounce} invalid bounce_rate values")
             
             # Check for missing values
-            missing_count = self.df[col].isna().sum()
+            missing_count = counts[col]['missing']
             if missing_count > 0:
-                print(f"⚠ Warning: {missing_count} missing values in '{col}'")
+                self._write(f"⚠ Warning: {missing_count} missing values in '{col}'")
                 self.issues.append(f"{missing_count} missing values in '{col}'")
         
         if all_valid and not self.issues:
-            print("✓ All numeric validations passed")
+            self._write("✓ All numeric validations passed")
         
         return all_valid
     
-    def validate_categorical_columns(self):
+    def _category_counts(self, df):
+        """Value counts of each categorical column (a bincount over its category codes)"""
+        counts = {}
+        
+        for col in CATEGORICAL_COLUMNS:
+            values = df[col]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            
+            # Missing values have code -1 and aren't counted, as in value_counts()
+            codes = values.cat.codes.to_numpy()
+            tally = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+            counts[col] = pd.Series(tally, index=values.cat.categories)
+        
+        return counts
+    
+    def validate_categorical_columns(self, counts=None, total=None):
         """Validate categorical columns"""
-        print("\n📊 Categorical Column Summary:")
+        if counts is None:
+            counts, total = self._category_counts(self.df), len(self.df)
+        
+        self._write("\n📊 Categorical Column Summary:")
         
-        for col in ['page', 'device', 'country']:
-            unique_count = self.df[col].nunique()
-            top_values = self.df[col].value_counts().head(5)
+        for col in CATEGORICAL_COLUMNS:
+            tally = counts[col].to_numpy()
+            unique_count = np.count_nonzero(tally)
             
-            print(f"\n  {col}:")
-            print(f"    - Unique values: {unique_count}")
-            print(f"    - Top 5:")
-            for val, count in top_values.items():
-                print(f"      {val}: {count:,} ({count/len(self.df)*100:.1f}%)")
+            # Partial selection of the 5 largest counts, then order just those (ties by category order)
+            n_top = min(5, unique_count)
+            top = np.argpartition(-tally, n_top - 1)[:n_top] if 0 < n_top < len(tally) else np.arange(n_top)
+            top = top[np.lexsort((top, -tally[top]))]
+            top_counts = tally[top]
+            top_pcts = top_counts / total * 100 if total else top_counts
+            
+            self._write(f"\n  {col}:")
+            self._write(f"    - Unique values: {unique_count}")
+            self._write(f"    - Top 5:")
+            if n_top:
+                self._write("\n".join(f"      {val}: {count:,} ({pct:.1f}%)"
+                                       for val, count, pct in zip(counts[col].index[top], top_counts, top_pcts)))
         
         return True
     
-    def check_data_quality(self):
+    def _quality_counts(self, df):
+        """Count rows that break the sessions/users/conversions logic"""
+        # Pull the three columns once and count all three checks through one boolean buffer
+        sessions = df['sessions'].to_numpy(copy=False)
+        users = df['users'].to_numpy(copy=False)
+        conversions = df['conversions'].to_numpy(copy=False)
+        mask = np.empty(len(df), dtype=bool)
+        
+        return {
+            'sessions_lt_users': np.count_nonzero(np.less(sessions, users, out=mask)),
+            'conversions_gt_sessions': np.count_nonzero(np.greater(conversions, sessions, out=mask)),
+            'zero_sessions': np.count_nonzero(np.equal(sessions, 0, out=mask))
+        }
+    
+    def _row_hashes(self, df):
+        """64-bit hash per row; numeric columns are hashed as float64 so chunks typed differently agree"""
+        numeric = {col: 'float64' for col in NUMERIC_COLUMNS if pd.api.types.is_numeric_dtype(df[col])}
+        return pd.util.hash_pandas_object(df.astype(numeric), index=False).values
+    
+    def check_data_quality(self, counts=None):
         """Check overall data quality metrics"""
-        print("\n📈 Data Quality Metrics:")
+        if counts is None:
+            # Hash every row once; clean_data reuses the hashes to drop the duplicates
+            self._hashes = self._row_hashes(self.df)
+            counts = {
+                'records': len(self.df),
+                'duplicates': len(self.df) - len(np.unique(self._hashes)),
+                **self._quality_counts(self.df)
+            }
         
-        total_records = len(self.df)
+        self._write("\n📈 Data Quality Metrics:")
+        
+        total_records = counts['records']
         
         # Check for duplicates
-        duplicates = self.df.duplicated().sum()
-        print(f"  - Duplicate rows: {duplicates:,} ({duplicates/total_records*100:.2f}%)")
+        duplicates = counts['duplicates']
+        self._write(f"  - Duplicate rows: {duplicates:,} ({duplicates/total_records*100:.2f}%)")
         
         # Check sessions vs users logic
-        invalid_sessions = (self.df['sessions'] < self.df['users']).sum()
+        invalid_sessions = counts['sessions_lt_users']
         if invalid_sessions > 0:
-            print(f"  ⚠ Warning: {invalid_sessions} records where sessions < users")
+            self._write(f"  ⚠ Warning: {invalid_sessions} records where sessions < users")
             self.issues.append(f"{invalid_sessions} records with sessions < users")
         
         # Check conversions vs sessions logic
-        invalid_conversions = (self.df['conversions'] > self.df['sessions']).sum()
+        invalid_conversions = counts['conversions_gt_sessions']
         if invalid_conversions > 0:
-            print(f"  ⚠ Warning: {invalid_conversions} records where conversions > sessions")
+            self._write(f"  ⚠ Warning: {invalid_conversions} records where conversions > sessions")
             self.issues.append(f"{invalid_conversions} records with conversions > sessions")
         
         # Check for zero sessions
-        zero_sessions = (self.df['sessions'] == 0).sum()
+        zero_sessions = counts['zero_sessions']
         if zero_sessions > 0:
-            print(f"  ⚠ Warning: {zero_sessions} records with zero sessions")
+            self._write(f"  ⚠ Warning: {zero_sessions} records with zero sessions")
             self.issues.append(f"{zero_sessions} records with zero sessions")
         
         return True
     
-    def generate_summary_stats(self):
+    def _summary_totals(self, numeric_counts, records):
+        """Sums and non-missing counts behind the summary statistics, taken from _numeric_counts"""
+        return {
+            'records': records,
+            'sessions': numeric_counts['sessions']['sum'],
+            'users': numeric_counts['users']['sum'],
+            'conversions': numeric_counts['conversions']['sum'],
+            'bounce_rate_sum': numeric_counts['bounce_rate']['sum'],
+            'bounce_rate_count': numeric_counts['bounce_rate']['count'],
+            'duration_sum': numeric_counts['avg_session_duration']['sum'],
+            'duration_count': numeric_counts['avg_session_duration']['count']
+        }
+    
+    def generate_summary_stats(self, totals=None, date_range=None):
         """Generate summary statistics"""
-        print("\n📊 Summary Statistics:")
+        if totals is None:
+            # Reuse the numeric pass from validate_numeric_columns when it already ran
+            if self._numeric is None:
+                self._numeric = self._numeric_counts(self.df)
+            totals = self._summary_totals(self._numeric, len(self.df))
+            date_range = (self.df['date'].min(), self.df['date'].max())
+        
+        self._write("\n📊 Summary Statistics:")
         
         stats = {
-            'Total Records': len(self.df),
-            'Date Range': f"{self.df['date'].min()} to {self.df['date'].max()}",
-            'Total Sessions': self.df['sessions'].sum(),
-            'Total Users': self.df['users'].sum(),
-            'Total Conversions': self.df['conversions'].sum(),
-            'Avg Bounce Rate': f"{self.df['bounce_rate'].mean()*100:.2f}%",
-            'Avg Session Duration': f"{self.df['avg_session_duration'].mean():.0f}s",
-            'Overall Conversion Rate': f"{(self.df['conversions'].sum()/self.df['sessions'].sum()*100):.2f}%"
+            'Total Records': totals['records'],
+            'Date Range': f"{date_range[0]} to {date_range[1]}" if date_range else "unavailable (dates could not be parsed)",
+            'Total Sessions': totals['sessions'],
+            'Total Users': totals['users'],
+            'Total Conversions': totals['conversions'],
+            'Avg Bounce Rate': f"{totals['bounce_rate_sum']/totals['bounce_rate_count']*100:.2f}%",
+            'Avg Session Duration': f"{totals['duration_sum']/totals['duration_count']:.0f}s",
+            'Overall Conversion Rate': f"{(totals['conversions']/totals['sessions']*100):.2f}%"
         }
         
         for key, value in stats.items():
-            print(f"  - {key}: {value}")
+            self._write(f"  - {key}: {value}")
         
         return stats
     
-    def clean_data(self, output_file='cleaned_data.csv'):
-        """Clean and export cleaned data"""
-        print("\n🧹 Cleaning Data...")
+    def clean_data(self, output_file='cleaned_data.csv', output_format='csv'):
+        """Clean and export cleaned data (as CSV, or as zstd-compressed Parquet)"""
+        self._write("\n🧹 Cleaning Data...")
         
         original_count = len(self.df)
         
-        # Remove duplicates
-        self.df = self.df.drop_duplicates()
-        print(f"  - Removed {original_count - len(self.df)} duplicate records")
+        # Float columns holding only whole numbers and no gaps (e.g. durations read as float32)
+        # were integers in the source CSV; note them so the export writes them without ".0"
+        integral = [col for col in NUMERIC_COLUMNS if self.df[col].dtype.kind == 'f'
+                    and np.array_equal(self.df[col].to_numpy(), np.trunc(self.df[col].to_numpy()))]
+        
+        # Remove duplicates: the hashes from check_data_quality narrow the search to rows whose
+        # hash repeats, and only those rows are compared in full (a collision never drops a row)
+        if self._hashes is None or len(self._hashes) != len(self.df):
+            self._hashes = self._row_hashes(self.df)
+        _, inverse, hash_counts = np.unique(self._hashes, return_inverse=True, return_counts=True)
+        candidates = hash_counts[inverse] > 1
+        keep = np.ones(len(self.df), dtype=bool)
+        if candidates.any():
+            keep[candidates] = ~self.df[candidates].duplicated().to_numpy()
+        self.df = self.df[keep]
+        self._hashes = self._numeric = None
+        self._write(f"  - Removed {original_count - len(self.df)} duplicate records")
         
         # Remove records with zero sessions
         self.df = self.df[self.df['sessions'] > 0]
-        print(f"  - Removed records with zero sessions")
+        self._write(f"  - Removed records with zero sessions")
         
         # Cap bounce rate at 0-1
         self.df['bounce_rate'] = self.df['bounce_rate'].clip(0, 1)
         
-        # Ensure conversions don't exceed sessions
-        self.df['conversions'] = self.df[['conversions', 'sessions']].min(axis=1)
+        # Ensure conversions don't exceed sessions (fmin skips NaN like min(axis=1) did)
+        self.df['conversions'] = np.fmin(self.df['conversions'].to_numpy(), self.df['sessions'].to_numpy())
         
-        # Fill missing values if any
-        numeric_columns = ['sessions', 'users', 'conversions', 
-                          'bounce_rate', 'avg_session_duration']
-        for col in numeric_columns:
-            if self.df[col].isna().sum() > 0:
-                self.df[col].fillna(0, inplace=True)
+        # Fill missing values in one call over all numeric columns
+        self.df[NUMERIC_COLUMNS] = self.df[NUMERIC_COLUMNS].fillna(0)
         
-        # Export cleaned data
-        self.df.to_csv(output_file, index=False)
-        print(f"\n✓ Cleaned data exported to '{output_file}'")
-        print(f"  Final record count: {len(self.df):,}")
+        # Export cleaned data; Parquet keeps the dtypes and reloads without parsing
+        if output_format == 'parquet':
+            output_file = os.path.splitext(output_file)[0] + '.parquet'
+            self.df.to_parquet(output_file, engine='pyarrow', compression='zstd',
+                               row_group_size=1 << 20, index=False)
+        else:
+            self.df.astype({col: 'int64' for col in integral}).to_csv(output_file, index=False)
+        self._write(f"\n✓ Cleaned data exported to '{output_file}'")
+        self._write(f"  Final record count: {len(self.df):,}")
+        self._flush()
         
         return self.df
     
-    def run_full_validation(self):
+    def _print_step(self, step_name):
+        """Print a section header"""
+        self._write(f"\n{'='*60}")
+        self._write(f"  {step_name}")
+        self._write(f"{'='*60}")
+    
+    def _run_steps(self, steps):
+        """Run each (name, check) step under its header and print the verdict"""
+        all_passed = True
+        
+        for step_name, step_func in steps:
+            self._print_step(step_name)
+            try:
+                result = step_func()
+            except Exception:
+                self._flush()  # show the report so far before the traceback
+                raise
+            if not result:
+                all_passed = False
+        
+        self._print_verdict(all_passed)
+        return all_passed
+    
+    def _print_verdict(self, all_passed):
+        """Print the final verdict and the list of issues"""
+        self._write("\n" + "=" * 60)
+        if all_passed and not self.issues:
+            self._write("✓ VALIDATION PASSED: Data is ready for analysis!")
+        elif self.issues:
+            self._write(f"⚠ VALIDATION COMPLETED WITH {len(self.issues)} ISSUES:")
+            for i, issue in enumerate(self.issues, 1):
+                self._write(f"  {i}. {issue}")
+        else:
+            self._write("✗ VALIDATION FAILED: Please fix errors before proceeding")
+        self._write("=" * 60)
+        self._flush()
+    
+    def run_full_validation(self, output_format='csv', engine='pyarrow', use_cache=True):
         """Run complete validation pipeline"""
-        print("=" * 60)
-        print("🔍 DATA VALIDATION REPORT")
-        print("=" * 60)
+        self._write("=" * 60)
+        self._write("🔍 DATA VALIDATION REPORT")
+        self._write("=" * 60)
         
-        if not self.load_data():
+        if not self.load_data(engine=engine, use_cache=use_cache):
+            self._flush()
             return False
         
         steps = [
@@ -226,46 +546,176 @@ class DataValidator:
             ("Summary Statistics", self.generate_summary_stats)
         ]
         
-        all_passed = True
-        
-        for step_name, step_func in steps:
-            print(f"\n{'='*60}")
-            print(f"  {step_name}")
-            print(f"{'='*60}")
-            result = step_func()
-            if not result:
-                all_passed = False
-        
-        print("\n" + "=" * 60)
-        if all_passed and not self.issues:
-            print("✓ VALIDATION PASSED: Data is ready for analysis!")
-        elif self.issues:
-            print(f"⚠ VALIDATION COMPLETED WITH {len(self.issues)} ISSUES:")
-            for i, issue in enumerate(self.issues, 1):
-                print(f"  {i}. {issue}")
-        else:
-            print("✗ VALIDATION FAILED: Please fix errors before proceeding")
-        print("=" * 60)
+        all_passed = self._run_steps(steps)
         
         # Ask if user wants to clean data
         if self.issues:
             response = input("\n🤔 Would you like to clean the data automatically? (y/n): ")
             if response.lower() == 'y':
-                self.clean_data()
+                self.clean_data(output_format=output_format)
+        
+        return all_passed
+    
+    def _read_chunks(self, chunksize, typed):
+        """Iterate over the file in chunks of rows, typed with COLUMN_DTYPES or with only the dimensions set"""
+        if self.filepath.endswith('.parquet'):
+            return (batch.to_pandas() for batch in pq.ParquetFile(self.filepath).iter_batches(batch_size=chunksize))
+        
+        dtype = COLUMN_DTYPES if typed else {col: 'category' for col in CATEGORICAL_COLUMNS}
+        return pd.read_csv(self.filepath, chunksize=chunksize, dtype=dtype)
+    
+    def _scan_chunks(self, chunks):
+        """Run every check over each chunk in turn and add up the counts"""
+        scan = {
+            'records': 0, 'dates': None, 'date_error': None, 'numeric': None,
+            'categories': None, 'quality': None, 'stopped': False
+        }
+        row_hashes = []
+        
+        for chunk in chunks:
+            scan['records'] += len(chunk)
+            
+            # Dates: stop parsing after the first chunk that fails, like the in-memory check
+            if scan['date_error'] is None:
+                try:
+                    counts = self._date_counts(self._parse_dates(chunk['date']))
+                except Exception as e:
+                    scan['date_error'] = e
+                else:
+                    if scan['dates'] is not None:
+                        counts = {
+                            'future': scan['dates']['future'] + counts['future'],
+                            'min': min(scan['dates']['min'], counts['min']),
+                            'max': max(scan['dates']['max'], counts['max'])
+                        }
+                    scan['dates'] = counts
+            
+            # Numeric: the cross-column checks need numbers, so a non-numeric column ends the scan
+            counts = self._numeric_counts(chunk)
+            if scan['numeric'] is not None:
+                counts = {col: None if counts[col] is None else
+                          {key: scan['numeric'][col][key] + counts[col][key] for key in counts[col]}
+                          for col in NUMERIC_COLUMNS}
+            scan['numeric'] = counts
+            if any(counts[col] is None for col in NUMERIC_COLUMNS):
+                scan['stopped'] = True
+                return scan
+            
+            # Categorical value counts (different chunks may see different categories)
+            counts = self._category_counts(chunk)
+            if scan['categories'] is not None:
+                counts = {col: pd.concat([scan['categories'][col], counts[col]]).groupby(level=0, observed=True).sum()
+                          for col in CATEGORICAL_COLUMNS}
+            scan['categories'] = counts
+            
+            counts = self._quality_counts(chunk)
+            if scan['quality'] is not None:
+                counts = {key: scan['quality'][key] + counts[key] for key in counts}
+            scan['quality'] = counts
+            
+            # Duplicates are found across chunks from one 64-bit hash per distinct row
+            row_hashes.append(np.unique(self._row_hashes(chunk)))
+        
+        if scan['records'] > 0:
+            scan['quality']['records'] = scan['records']
+            scan['quality']['duplicates'] = scan['records'] - len(np.unique(np.concatenate(row_hashes)))
+        
+        return scan
+    
+    def run_streaming_validation(self, chunksize=STREAM_CHUNK_SIZE):
+        """Run the validation report in one pass over the CSV, one chunk in memory at a time"""
+        self._write("=" * 60)
+        self._write("🔍 DATA VALIDATION REPORT (streaming)")
+        self._write("=" * 60)
+        
+        try:
+            if self.filepath.endswith('.parquet'):
+                columns = pq.ParquetFile(self.filepath).schema_arrow.names
+            else:
+                columns = pd.read_csv(self.filepath, nrows=0).columns
+            
+            # Without every column the per-chunk checks can't run; report just that
+            if not set(NUMERIC_COLUMNS + CATEGORICAL_COLUMNS + ['date']) <= set(columns):
+                return self._run_steps([("Column Validation", lambda: self.validate_columns(columns))])
+            
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)  # NaN cast noise before the ValueError
+                    scan = self._scan_chunks(self._read_chunks(chunksize, typed=True))
+            except ValueError:
+                # A chunk didn't fit the 32-bit schema (missing counts, text in a metric):
+                # rescan with inferred dtypes so the checks can report it
+                scan = self._scan_chunks(self._read_chunks(chunksize, typed=False))
+        except FileNotFoundError:
+            self._write(f"✗ Error: File '{self.filepath}' not found")
+            self._flush()
+            return False
+        except Exception as e:
+            self._write(f"✗ Error loading file: {str(e)}")
+            self._flush()
+            return False
+        
+        records = scan['records']
+        
+        if scan['stopped']:
+            self._write(f"✓ Streamed {records:,} records (stopped at a non-numeric value)")
+            return self._run_steps([
+                ("Column Validation", lambda: self.validate_columns(columns)),
+                ("Numeric Validation", lambda: self.validate_numeric_columns(scan['numeric']))
+            ])
+        
+        if records == 0:
+            self._write("✗ Error: File has no records")
+            self._flush()
+            return False
+        
+        self._write(f"✓ Successfully streamed {records:,} records")
+        date_range = None if scan['date_error'] is not None else (scan['dates']['min'], scan['dates']['max'])
+        
+        steps = [
+            ("Column Validation", lambda: self.validate_columns(columns)),
+            ("Date Validation", lambda: self.validate_dates(scan['dates'], scan['date_error'])),
+            ("Numeric Validation", lambda: self.validate_numeric_columns(scan['numeric'])),
+            ("Categorical Validation", lambda: self.validate_categorical_columns(scan['categories'], records)),
+            ("Quality Checks", lambda: self.check_data_quality(scan['quality'])),
+            ("Summary Statistics", lambda: self.generate_summary_stats(self._summary_totals(scan['numeric'], records),
+                                                                       date_range))
+        ]
+        
+        all_passed = self._run_steps(steps)
+        
+        if self.issues:
+            self._write("\nℹ Run without --stream to clean the data (cleaning needs the full dataset in memory)")
+            self._flush()
         
         return all_passed
 
 
 def main():
     """Main execution"""
-    if len(sys.argv) > 1:
-        filepath = sys.argv[1]
-    else:
-        filepath = 'web_traffic_data.csv'
+    parser = argparse.ArgumentParser(description="Validate and clean web traffic data")
+    parser.add_argument('filepath', nargs='?', default='web_traffic_data.csv',
+                        help="CSV (or Parquet) file to validate")
+    parser.add_argument('--stream', action='store_true',
+                        help="validate in one chunked pass instead of loading the whole file")
+    parser.add_argument('--chunksize', type=int, default=STREAM_CHUNK_SIZE,
+                        help="rows per chunk with --stream (default: %(default)s)")
+    parser.add_argument('--output-format', choices=['csv', 'parquet'], default='csv',
+                        help="format for the cleaned data file")
+    parser.add_argument('--gpu', action='store_true',
+                        help="parse the CSV with cuDF on the GPU (falls back to PyArrow without cuDF)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"always parse the CSV instead of reusing the copy in {VALIDATOR_CACHE_DIR}")
+    args = parser.parse_args()
     
-    validator = DataValidator(filepath)
-    validator.run_full_validation()
+    validator = DataValidator(args.filepath)
+    if args.stream:
+        validator.run_streaming_validation(chunksize=args.chunksize)
+    else:
+        validator.run_full_validation(output_format=args.output_format,
+                                      engine='cudf' if args.gpu else 'pyarrow',
+                                      use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()